@@ -5,36 +5,65 @@ Handles audio device detection, validation, and selection with robust error hand
 
 import pyaudio
 import sys
+import json
+import time
 import platform
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Tuple
 
-from ..config import VERBOSE_MODE
+from ..config import VERBOSE_MODE, AUDIO_DEVICE_CACHE_TTL, AUDIO_DEVICE_CACHE_FILE
 
 logger = logging.getLogger(__name__)
 
+# Process-invariant system details, looked up once at import
+# (platform.architecture() may shell out on some systems)
+_SYSTEM_INFO: Dict[str, str] = {
+    'platform': platform.system(),
+    'platform_version': platform.version(),
+    'architecture': platform.architecture()[0]
+}
+
+# Concurrent device probes; each one mostly waits on PortAudio I/O
+_MAX_PROBE_WORKERS = 4
+
 
 class AudioDeviceInfo:
     """Container for audio device information"""
     
+    __slots__ = (
+        'index', 'name', 'max_input_channels', 'max_output_channels',
+        'default_sample_rate', 'host_api', 'is_input_device', 'is_output_device',
+        'tested', '_str_cache'
+    )
+    
     def __init__(self, index: int, info: dict):
+        get = info.get
+        max_input_channels = get('maxInputChannels', 0)
+        max_output_channels = get('maxOutputChannels', 0)
+        
         self.index = index
-        self.name = info.get('name', 'Unknown Device')
-        self.max_input_channels = info.get('maxInputChannels', 0)
-        self.max_output_channels = info.get('maxOutputChannels', 0)
-        self.default_sample_rate = info.get('defaultSampleRate', 44100)
-        self.host_api = info.get('hostApi', 0)
-        self.is_input_device = self.max_input_channels > 0
-        self.is_output_device = self.max_output_channels > 0
-    
-    def __str__(self):
+        self.name = get('name', 'Unknown Device')
+        self.max_input_channels = max_input_channels
+        self.max_output_channels = max_output_channels
+        self.default_sample_rate = get('defaultSampleRate', 44100)
+        self.host_api = get('hostApi', 0)
+        self.is_input_device = max_input_channels > 0
+        self.is_output_device = max_output_channels > 0
+        # True once the device has been opened successfully by a probe
+        self.tested = False
+        
+        # Device details never change, so format the description once
         device_type = []
         if self.is_input_device:
-            device_type.append(f"Input({self.max_input_channels}ch)")
+            device_type.append(f"Input({max_input_channels}ch)")
         if self.is_output_device:
-            device_type.append(f"Output({self.max_output_channels}ch)")
-        
-        return f"[{self.index}] {self.name} - {'/'.join(device_type)} @ {self.default_sample_rate}Hz"
+            device_type.append(f"Output({max_output_channels}ch)")
+        self._str_cache = f"[{index}] {self.name} - {'/'.join(device_type)} @ {self.default_sample_rate}Hz"
+    
+    def __str__(self):
+        return self._str_cache
 
 
 class AudioManager:
@@ -48,16 +77,21 @@ class AudioManager:
         self.selected_output_device: Optional[AudioDeviceInfo] = None
         self.system_info = self._get_system_info()
         
+        # Devices that passed a probe, persisted across runs and keyed by _cache_key;
+        # failures are never cached, so a transient one is re-probed next start
+        self._probe_cache: Dict[str, bool] = {}
+        self._probe_cache_dirty = False
+        self._device_count = 0
+        
+        # PortAudio stream open/close is not thread-safe; probes only overlap their reads
+        self._pa_lock = threading.Lock()
+        
         if VERBOSE_MODE:
             logger.info("AudioManager initialized")
         
     def _get_system_info(self) -> Dict[str, str]:
         """Get system information for audio troubleshooting"""
-        return {
-            'platform': platform.system(),
-            'platform_version': platform.version(),
-            'architecture': platform.architecture()[0]
-        }
+        return _SYSTEM_INFO
     
     def initialize(self) -> bool:
         """Initialize PyAudio and discover devices"""
@@ -73,6 +107,8 @@ class AudioManager:
             # Select best devices
             if not self._select_devices():
                 return False
+            if self._probe_cache_dirty:
+                self._save_probe_cache()
             
             print("✅ Audio system initialized successfully")
             logger.info("Audio system initialized successfully")
@@ -88,44 +124,27 @@ class AudioManager:
     def _discover_devices(self) -> bool:
         """Discover and catalog all available audio devices"""
         try:
-            device_count = self.audio.get_device_count()
-            print(f"🔍 Found {device_count} audio devices")
-            logger.info(f"Found {device_count} audio devices")
+            # Per-device lines are buffered and written once, since each print
+            # flushes the console and that dominates discovery with many devices
+            lines: List[str] = []
+            input_candidates = self._enumerate_devices(lines)
             
-            self.available_input_devices = []
-            self.available_output_devices = []
+            self.selected_input_device = None
+            if VERBOSE_MODE:
+                # Probe every input so the listing shows which devices actually work
+                self._probe_input_devices(input_candidates, lines)
+            else:
+                # Trust the PortAudio enumeration; only the device that is about
+                # to be selected gets probed, in _select_devices
+                self.available_input_devices = input_candidates
+                for device in input_candidates:
+                    logger.debug(f"Input device: {device}")
             
-            for i in range(device_count):
-                try:
-                    device_info = self.audio.get_device_info_by_index(i)
-                    device = AudioDeviceInfo(i, device_info)
-                    
-                    if device.is_input_device:
-                        # Test if the input device actually works
-                        if self._test_input_device(device):
-                            self.available_input_devices.append(device)
-                            if VERBOSE_MODE:
-                                print(f"✅ Input: {device}")
-                            logger.debug(f"Working input device: {device}")
-                        else:
-                            if VERBOSE_MODE:
-                                print(f"⚠️  Input (failed test): {device}")
-                            logger.warning(f"Input device failed test: {device}")
-                    
-                    if device.is_output_device:
-                        self.available_output_devices.append(device)
-                        if VERBOSE_MODE:
-                            print(f"✅ Output: {device}")
-                        logger.debug(f"Output device: {device}")
-                        
-                except Exception as e:
-                    if VERBOSE_MODE:
-                        print(f"⚠️  Device {i}: Error getting info - {e}")
-                    logger.warning(f"Error getting device {i} info: {e}")
-                    continue
+            if lines:
+                sys.stdout.write("".join(lines))
             
             print(f"\n📊 Summary:")
-            print(f"   🎤 Working input devices: {len(self.available_input_devices)}")
+            print(f"   🎤 Input devices: {len(self.available_input_devices)}")
             print(f"   🔊 Output devices: {len(self.available_output_devices)}")
             
             logger.info(f"Device discovery complete: {len(self.available_input_devices)} input, {len(self.available_output_devices)} output")
@@ -144,25 +163,170 @@ class AudioManager:
             print(f"❌ {error_msg}")
             return False
     
+    def _enumerate_devices(self, lines: List[str]) -> List[AudioDeviceInfo]:
+        """Catalog every device without probing, returning the input candidates"""
+        device_count = self.audio.get_device_count()
+        lines.append(f"🔍 Found {device_count} audio devices\n")
+        self._device_count = device_count
+        self._probe_cache = self._load_probe_cache()
+        self._probe_cache_dirty = False
+        logger.info(f"Found {device_count} audio devices")
+        
+        self.available_input_devices = []
+        self.available_output_devices = []
+        
+        input_candidates: List[AudioDeviceInfo] = []
+        get_info = self.audio.get_device_info_by_index
+        for i in range(device_count):
+            try:
+                device_info = get_info(i)
+                
+                # Skip endpoints with no usable channels before building a wrapper
+                if (device_info.get('maxInputChannels', 0) == 0 and
+                        device_info.get('maxOutputChannels', 0) == 0):
+                    continue
+                
+                device = AudioDeviceInfo(i, device_info)
+                
+                if device.is_input_device:
+                    input_candidates.append(device)
+                
+                if device.is_output_device:
+                    self.available_output_devices.append(device)
+                    if VERBOSE_MODE:
+                        lines.append(f"✅ Output: {device}\n")
+                    logger.debug(f"Output device: {device}")
+                    
+            except Exception as e:
+                if VERBOSE_MODE:
+                    lines.append(f"⚠️  Device {i}: Error getting info - {e}\n")
+                logger.warning(f"Error getting device {i} info: {e}")
+                continue
+        
+        return input_candidates
+    
+    def _find_default_input_device(self, candidates: List[AudioDeviceInfo]) -> Optional[AudioDeviceInfo]:
+        """Return the candidate matching the system default input device, if any"""
+        try:
+            default_index = self.audio.get_default_input_device_info()['index']
+        except Exception as e:
+            logger.warning(f"Could not get default input device: {e}")
+            return None
+        
+        for device in candidates:
+            if device.index == default_index:
+                return device
+        return None
+    
+    def _probe_input_devices(self, candidates: List[AudioDeviceInfo], lines: List[str]) -> None:
+        """Test input devices and keep the working ones"""
+        # Devices that worked recently are trusted; everything else is probed
+        results: Dict[int, bool] = {}
+        uncached = []
+        for device in candidates:
+            if self._probe_cache.get(self._cache_key(device)):
+                results[device.index] = True
+            else:
+                uncached.append(device)
+        
+        # Each probe blocks in PortAudio on its own device, so run them concurrently
+        if uncached:
+            with ThreadPoolExecutor(max_workers=min(_MAX_PROBE_WORKERS, len(uncached))) as executor:
+                futures = {
+                    executor.submit(self._test_input_device, device): device
+                    for device in uncached
+                }
+                for future in as_completed(futures):
+                    device = futures[future]
+                    works = future.result()
+                    results[device.index] = works
+                    if works:
+                        self._probe_cache[self._cache_key(device)] = True
+                        self._probe_cache_dirty = True
+        
+        # Keep device index order so listings and fallback selection are deterministic
+        for device in candidates:
+            if results[device.index]:
+                device.tested = True
+                self.available_input_devices.append(device)
+                if VERBOSE_MODE:
+                    lines.append(f"✅ Input: {device}\n")
+                logger.debug(f"Working input device: {device}")
+            else:
+                if VERBOSE_MODE:
+                    lines.append(f"⚠️  Input (failed test): {device}\n")
+                logger.warning(f"Input device failed test: {device}")
+    
+    def _validate(self, device: AudioDeviceInfo) -> bool:
+        """Probe an input device on demand, remembering a successful result"""
+        if not device.tested:
+            key = self._cache_key(device)
+            if self._probe_cache.get(key):
+                device.tested = True
+            elif self._test_input_device(device):
+                device.tested = True
+                self._probe_cache[key] = True
+                self._probe_cache_dirty = True
+        return device.tested
+    
+    def _cache_key(self, device: AudioDeviceInfo) -> str:
+        """Identify a device across runs for the probe cache"""
+        return f"{_SYSTEM_INFO['platform']}|{device.host_api}|{device.name}|{device.index}"
+    
+    def _load_probe_cache(self) -> Dict[str, bool]:
+        """Load cached probe results, ignoring them if stale or for a different device set"""
+        if AUDIO_DEVICE_CACHE_TTL <= 0:
+            return {}
+        try:
+            with open(AUDIO_DEVICE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if (cache.get('device_count') != self._device_count or
+                    time.time() - cache.get('timestamp', 0) > AUDIO_DEVICE_CACHE_TTL):
+                return {}
+            # Trust only successes, whatever an older file recorded
+            return {key: True for key, works in cache.get('devices', {}).items() if works}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.debug(f"No usable audio device cache: {e}")
+            return {}
+    
+    def _save_probe_cache(self) -> None:
+        """Persist probe results so the next start can skip re-probing"""
+        if AUDIO_DEVICE_CACHE_TTL <= 0:
+            return
+        try:
+            AUDIO_DEVICE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(AUDIO_DEVICE_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'device_count': self._device_count,
+                    'timestamp': time.time(),
+                    'devices': self._probe_cache
+                }, f)
+            self._probe_cache_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save audio device cache: {e}")
+    
     def _test_input_device(self, device: AudioDeviceInfo, sample_rate: int = 16000) -> bool:
         """Test if an input device can actually be opened for recording"""
         try:
             # Try to open a stream with the device
-            stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=sample_rate,
-                input=True,
-                input_device_index=device.index,
-                frames_per_buffer=1024
-            )
+            with self._pa_lock:
+                stream = self.audio.open(
+                    format=pyaudio.paInt16,
+                    channels=1,
+                    rate=sample_rate,
+                    input=True,
+                    input_device_index=device.index,
+                    frames_per_buffer=1024
+                )
             
-            # Try to read a small amount of data
-            stream.read(1024, exception_on_overflow=False)
-            
-            # Close the stream
-            stream.stop_stream()
-            stream.close()
+            try:
+                # Try to read a small amount of data
+                stream.read(1024, exception_on_overflow=False)
+            finally:
+                # Close the stream
+                with self._pa_lock:
+                    stream.stop_stream()
+                    stream.close()
             
             logger.debug(f"Input device test passed: {device.name}")
             return True
@@ -180,24 +344,32 @@ class AudioManager:
             print("❌ No input devices available for selection")
             return False
         
-        # Try to get default input device first
-        try:
-            default_input = self.audio.get_default_input_device_info()
-            default_index = default_input['index']
-            
-            # Check if default device is in our working list
-            for device in self.available_input_devices:
-                if device.index == default_index:
-                    self.selected_input_device = device
-                    print(f"🎤 Selected default input device: {device}")
-                    logger.info(f"Selected default input device: {device.name}")
-                    break
-        except Exception as e:
-            logger.warning(f"Could not get default input device: {e}")
+        # Try the default device first, then the rest in index order, probing
+        # each candidate only when it is about to be selected
+        default_device = self._find_default_input_device(self.available_input_devices)
+        candidates = [device for device in self.available_input_devices if device is not default_device]
+        if default_device:
+            candidates.insert(0, default_device)
+        
+        self.selected_input_device = None
+        for device in candidates:
+            if self._validate(device):
+                self.selected_input_device = device
+                break
+            self.available_input_devices.remove(device)
+            print(f"⚠️  Input device failed test: {device}")
+            logger.warning(f"Input device failed test: {device}")
         
-        # If no default device found, use the first working device
         if not self.selected_input_device:
-            self.selected_input_device = self.available_input_devices[0]
+            print("❌ No working input devices found!")
+            logger.error("No working input devices found")
+            self._print_input_device_troubleshooting()
+            return False
+        
+        if self.selected_input_device is default_device:
+            print(f"🎤 Selected default input device: {self.selected_input_device}")
+            logger.info(f"Selected default input device: {self.selected_input_device.name}")
+        else:
             print(f"🎤 Selected first available input device: {self.selected_input_device}")
             logger.info(f"Selected first available input device: {self.selected_input_device.name}")
         
@@ -242,7 +414,8 @@ class AudioManager:
             print("\n🎤 Input Devices (Microphones):")
             for device in self.available_input_devices:
                 marker = "👉" if device == self.selected_input_device else "  "
-                print(f"{marker} {device}")
+                status = "" if device.tested else " (not probed)"
+                print(f"{marker} {device}{status}")
         else:
             print("\n❌ No working input devices found")
         
@@ -4,26 +4,91 @@ Handles microphone input and audio file operations with enhanced device manageme
 """
 
 import pyaudio
-import wave
 import numpy as np
-import threading
-import time
 import os
+import math
 import logging
+import queue
+from collections import deque
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple, Union
 
 from ..config import (
-    CHUNK_SIZE, SAMPLE_RATE, CHANNELS, RECORD_DURATION,
+    CHUNK_SIZE, SAMPLE_RATE, CHANNELS, RECORD_DURATION, FRAMES_PER_BUFFER,
     SILENCE_THRESHOLD, SILENCE_DURATION, MIN_RECORDING_DURATION,
     PRE_BUFFER_DURATION, VOLUME_SMOOTHING_WINDOW,
-    AMBIENT_NOISE_CALIBRATION_TIME, TEMP_AUDIO_DIR, TEMP_INPUT_FILE,
+    AMBIENT_NOISE_CALIBRATION_TIME, USE_SILERO_VAD, SILERO_VAD_THRESHOLD, USE_SOUNDDEVICE,
+    TEMP_AUDIO_DIR, TEMP_INPUT_FILE,
     VERBOSE_MODE
 )
 from .manager import AudioManager
 
+def _mean_square_int16(samples: np.ndarray) -> float:
+    # Sum of squares in one fused BLAS dot product. float64 is exact here: every
+    # partial sum is an integer far below 2**53 for any realistic chunk, and the
+    # float dot kernel is about twice as fast as numpy's integer one
+    if samples.size == 0:
+        return 0.0
+    wide = samples.astype(np.float64)
+    return float(np.dot(wide, wide)) / samples.size
+
+
+try:
+    import sounddevice
+except (ImportError, OSError):
+    # Missing package or PortAudio library; capture falls back to PyAudio
+    sounddevice = None
+
 logger = logging.getLogger(__name__)
 
+# Loop-invariant chunk timing, precomputed so the VAD loop only counts chunks
+_CHUNK_SECONDS = CHUNK_SIZE / SAMPLE_RATE
+_CHUNKS_PER_SECOND = SAMPLE_RATE / CHUNK_SIZE
+_PRE_BUFFER_CHUNKS = int(_CHUNKS_PER_SECOND * PRE_BUFFER_DURATION)
+_CALIBRATION_CHUNKS = int(_CHUNKS_PER_SECOND * AMBIENT_NOISE_CALIBRATION_TIME)
+_SILENCE_CHUNKS = math.ceil(SILENCE_DURATION / _CHUNK_SECONDS)
+_MIN_RECORDING_CHUNKS = math.ceil(MIN_RECORDING_DURATION / _CHUNK_SECONDS)
+_MAX_RECORDING_CHUNKS = int(30 / _CHUNK_SECONDS)  # 30 seconds max
+
+# Samples in the longest possible VAD recording: pre-buffer plus the chunks
+# recorded up to and including the one that trips the safety cap
+_CAPTURE_SAMPLES = (_PRE_BUFFER_CHUNKS + _MAX_RECORDING_CHUNKS + 1) * CHUNK_SIZE * CHANNELS
+
+# Samples in one CHUNK_SIZE analysis window (all channels interleaved)
+_CHUNK_SAMPLES = CHUNK_SIZE * CHANNELS
+
+# Bytes per int16 sample, looked up once instead of on every save
+_SAMPLE_WIDTH = pyaudio.get_sample_size(pyaudio.paInt16)
+
+# Capture-to-VAD queue: about two seconds of chunks, and how long to wait for one
+_QUEUE_CHUNKS = max(8, int(2 / _CHUNK_SECONDS))
+_QUEUE_TIMEOUT = 2.0
+
+# Hysteresis: speech starts above the dynamic threshold and only ends once the
+# smoothed level drops below this fraction of it
+_VAD_EXIT_RATIO = 0.7
+
+# Samples per Silero VAD inference window (the model accepts only these sizes)
+_SILERO_WINDOW = 512 if SAMPLE_RATE == 16000 else 256
+
+
+class _SoundDeviceInput:
+    """sounddevice RawInputStream behind the start/stop/close API of a PyAudio stream"""
+    
+    __slots__ = ('_stream',)
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def start_stream(self) -> None:
+        self._stream.start()
+    
+    def stop_stream(self) -> None:
+        self._stream.stop()
+    
+    def close(self) -> None:
+        self._stream.close()
+
 
 class AudioRecorder:
     """Handles audio recording with voice activity detection"""
@@ -34,6 +99,18 @@ class AudioRecorder:
         self.frames = []
         self.input_device_index = None
         
+        # Preallocated VAD capture buffer, reused by every recording
+        self._capture = np.empty(_CAPTURE_SAMPLES, dtype=np.int16)
+        
+        # Input stream opened once and started/stopped around each recording
+        self._stream = None
+        self._stream_fpb = 0
+        self._pending = np.empty(0, dtype=np.int16)
+        self._chunk_queue: "queue.Queue[Tuple[np.ndarray, float]]" = queue.Queue(maxsize=_QUEUE_CHUNKS)
+        
+        # Optional neural speech detector; None means RMS-only VAD
+        self._speech_model = self._load_speech_model()
+        
         # Create temp directory if it doesn't exist
         Path(TEMP_AUDIO_DIR).mkdir(parents=True, exist_ok=True)
         
@@ -55,37 +132,82 @@ class AudioRecorder:
         # Show available devices in verbose mode
         if VERBOSE_MODE:
             self.audio_manager.list_devices()
+        
+        # Open the input stream up front so recordings only have to start it
+        try:
+            self._open_stream(FRAMES_PER_BUFFER)
+        except Exception as e:
+            logger.warning(f"Could not open input stream yet, will retry when recording: {e}")
             
         logger.info(f"Audio recorder initialized with device index: {self.input_device_index}")
         return True
     
-    def _calculate_rms(self, audio_data: bytes) -> float:
-        """Calculate RMS (Root Mean Square) for volume detection"""
+    def _load_speech_model(self):
+        """Load the Silero VAD model if enabled, installed and the audio format suits it"""
+        if not USE_SILERO_VAD:
+            return None
+        if SAMPLE_RATE not in (8000, 16000) or CHANNELS != 1 or CHUNK_SIZE < _SILERO_WINDOW:
+            logger.info("Silero VAD needs mono 8/16 kHz audio in chunks of at least one window, using RMS VAD")
+            return None
+        
         try:
-            audio_np = np.frombuffer(audio_data, dtype=np.int16)
-            return float(np.sqrt(np.mean(audio_np**2)))
+            from silero_vad import load_silero_vad
+            model = load_silero_vad()
+            
+            if VERBOSE_MODE:
+                print("✅ Silero VAD model loaded successfully")
+            logger.info("Silero VAD model loaded")
+            return model
+            
+        except ImportError:
+            logger.info("silero-vad not installed, using RMS VAD")
+            return None
         except Exception as e:
-            logger.warning(f"Error calculating RMS: {e}")
-            return 0.0
+            logger.warning(f"Failed to load Silero VAD, using RMS VAD: {e}")
+            return None
     
-    def _calibrate_ambient_noise(self, stream) -> float:
+    def _is_speech(self, samples: np.ndarray) -> bool:
+        """Ask the speech model whether a chunk that passed the RMS gate contains speech"""
+        if self._speech_model is None:
+            return True
+        
+        try:
+            import torch
+            
+            audio = torch.from_numpy(samples.astype(np.float32) / 32768.0)
+            with torch.no_grad():
+                for start in range(0, audio.numel() - _SILERO_WINDOW + 1, _SILERO_WINDOW):
+                    window = audio[start:start + _SILERO_WINDOW]
+                    if self._speech_model(window, SAMPLE_RATE).item() >= SILERO_VAD_THRESHOLD:
+                        return True
+            return False
+            
+        except Exception as e:
+            logger.warning(f"Silero VAD failed, falling back to RMS VAD: {e}")
+            self._speech_model = None
+            return True
+    
+    def _calibrate_ambient_noise(self, chunk_queue: "queue.Queue[Tuple[np.ndarray, float]]") -> float:
         """Calibrate ambient noise level for dynamic threshold adjustment"""
         print("🔧 Calibrating ambient noise level...")
-        noise_samples = []
-        
-        calibration_chunks = int(SAMPLE_RATE / CHUNK_SIZE * AMBIENT_NOISE_CALIBRATION_TIME)
+        # Per-chunk mean squares are collected here and reduced in one numpy pass
+        noise_ms = np.empty(_CALIBRATION_CHUNKS, dtype=np.float64)
+        collected = 0
         
-        for _ in range(calibration_chunks):
+        for _ in range(_CALIBRATION_CHUNKS):
             try:
-                data = stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                rms = self._calculate_rms(data)
-                noise_samples.append(rms)
+                _, ms = chunk_queue.get(timeout=_QUEUE_TIMEOUT)
+                noise_ms[collected] = ms
+                collected += 1
+            except queue.Empty:
+                logger.warning("No audio received during noise calibration")
+                break
             except Exception as e:
                 logger.warning(f"Error during noise calibration: {e}")
                 break
         
-        if noise_samples:
-            ambient_noise = np.mean(noise_samples)
+        if collected:
+            ambient_noise = float(np.sqrt(noise_ms[:collected]).mean())
             # Set dynamic threshold as ambient noise + buffer
             dynamic_threshold = max(SILENCE_THRESHOLD, ambient_noise * 2.5)
             print(f"🎯 Ambient noise: {ambient_noise:.1f}, Dynamic threshold: {dynamic_threshold:.1f}")
@@ -95,21 +217,146 @@ class AudioRecorder:
         logger.warning("No noise samples collected, using default threshold")
         return SILENCE_THRESHOLD
     
-    def _smooth_volume(self, volume_history: List[float], current_rms: float) -> float:
-        """Apply smoothing to volume detection to reduce false triggers"""
-        volume_history.append(current_rms)
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PyAudio stream callback"""
+        # One int16 view per block; windows are slices of it, not new buffers
+        self._queue_samples(np.frombuffer(in_data, dtype=np.int16))
+        return (None, pyaudio.paContinue)
+    
+    def _on_sounddevice_audio(self, indata, frames, time_info, status):
+        """sounddevice stream callback"""
+        # indata is a raw int16 buffer that PortAudio reuses after we return
+        self._queue_samples(np.frombuffer(indata, dtype=np.int16).copy())
+    
+    def _queue_samples(self, samples: np.ndarray) -> None:
+        """Queue CHUNK_SIZE windows of a captured block with their mean square
         
-        # Keep only the last N samples for smoothing
-        if len(volume_history) > VOLUME_SMOOTHING_WINDOW:
-            volume_history.pop(0)
+        Runs on PortAudio's thread, so capture keeps going while the VAD loop works.
+        """
+        if self._pending.size:
+            samples = np.concatenate((self._pending, samples))
+        full = samples.size - samples.size % _CHUNK_SAMPLES
+        self._pending = samples[full:]
         
-        # Return smoothed average
-        return float(np.mean(volume_history))
+        for start in range(0, full, _CHUNK_SAMPLES):
+            chunk = samples[start:start + _CHUNK_SAMPLES]
+            item = (chunk, _mean_square_int16(chunk))
+            try:
+                self._chunk_queue.put_nowait(item)
+            except queue.Full:
+                # Drop the oldest chunk rather than stall the audio thread
+                try:
+                    self._chunk_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._chunk_queue.put_nowait(item)
     
-    def record_chunk(self, duration: Optional[float] = None) -> Optional[List[bytes]]:
+    def _sounddevice_index(self) -> Optional[int]:
+        """sounddevice index of the selected PyAudio input device, or None if not found
+        
+        The two libraries may load different PortAudio builds, so the PyAudio index
+        is only trusted when name and host API match there.
+        """
+        device = self.audio_manager.selected_input_device
+        if device is None:
+            return None
+        host_api = self.audio_manager.audio.get_host_api_info_by_index(device.host_api)['name']
+        
+        def matches(info: dict) -> bool:
+            return (info['name'] == device.name and info['max_input_channels'] > 0 and
+                    sounddevice.query_hostapis(info['hostapi'])['name'] == host_api)
+        
+        # Same index first, then search by name for a build that numbers devices differently
+        devices = sounddevice.query_devices()
+        index = device.index
+        if 0 <= index < len(devices) and matches(devices[index]):
+            return index
+        for index, info in enumerate(devices):
+            if matches(info):
+                return index
+        return None
+    
+    def _open_stream(self, frames_per_buffer: int) -> None:
+        """Open the (stopped) callback-mode input stream shared by all recordings"""
+        self._stream_fpb = frames_per_buffer
+        
+        # Prefer sounddevice; the raw stream skips building an ndarray per block
+        if sounddevice is not None and USE_SOUNDDEVICE:
+            try:
+                device_index = self._sounddevice_index()
+                if device_index is not None:
+                    self._stream = _SoundDeviceInput(sounddevice.RawInputStream(
+                        samplerate=SAMPLE_RATE,
+                        channels=CHANNELS,
+                        dtype='int16',
+                        blocksize=frames_per_buffer,
+                        device=device_index,
+                        callback=self._on_sounddevice_audio
+                    ))
+                    return
+                logger.warning("Selected input device not found by sounddevice, using PyAudio")
+            except Exception as e:
+                logger.warning(f"sounddevice input failed, using PyAudio: {e}")
+        
+        # Open stream using AudioManager's PyAudio instance
+        self._stream = self.audio_manager.audio.open(
+            format=pyaudio.paInt16,
+            channels=CHANNELS,
+            rate=SAMPLE_RATE,
+            input=True,
+            input_device_index=self.input_device_index,
+            frames_per_buffer=frames_per_buffer,
+            stream_callback=self._on_audio,
+            start=False
+        )
+    
+    def _close_stream(self) -> None:
+        """Stop and close the shared input stream, if open"""
+        stream = getattr(self, "_stream", None)
+        if stream is None:
+            return
+        self._stream = None
+        try:
+            stream.stop_stream()
+            stream.close()
+        except Exception as e:
+            logger.warning(f"Error closing input stream: {e}")
+    
+    def _start_capture(self, frames_per_buffer: int) -> "queue.Queue[Tuple[np.ndarray, float]]":
+        """Start the shared stream with a fresh chunk queue, (re)opening it if needed"""
+        if self._stream is not None and self._stream_fpb != frames_per_buffer:
+            self._close_stream()
+        if self._stream is None:
+            self._open_stream(frames_per_buffer)
+        
+        # The stream is stopped here, so the callback cannot see a half-reset state
+        self._pending = np.empty(0, dtype=np.int16)
+        self._chunk_queue = queue.Queue(maxsize=_QUEUE_CHUNKS)
+        try:
+            self._stream.start_stream()
+        except Exception as e:
+            # The device may have changed since the stream was opened; reopen once
+            logger.warning(f"Reopening input stream: {e}")
+            self._close_stream()
+            self._open_stream(frames_per_buffer)
+            self._stream.start_stream()
+        return self._chunk_queue
+    
+    def _stop_capture(self) -> None:
+        """Stop the shared stream between recordings, keeping it open"""
+        try:
+            self._stream.stop_stream()
+        except Exception as e:
+            logger.warning(f"Error stopping input stream: {e}")
+            self._close_stream()
+    
+    def record_chunk(self, duration: Optional[float] = None,
+                     frames_per_buffer: Optional[int] = None) -> Optional[List[np.ndarray]]:
         """Record a single audio chunk with enhanced error handling"""
         if duration is None:
             duration = RECORD_DURATION
+        if frames_per_buffer is None:
+            frames_per_buffer = FRAMES_PER_BUFFER
         
         if self.input_device_index is None:
             logger.error("No input device available for recording")
@@ -117,24 +364,20 @@ class AudioRecorder:
             return None
             
         try:
-            # Open stream using AudioManager's PyAudio instance
-            stream = self.audio_manager.audio.open(
-                format=pyaudio.paInt16,
-                channels=CHANNELS,
-                rate=SAMPLE_RATE,
-                input=True,
-                input_device_index=self.input_device_index,
-                frames_per_buffer=CHUNK_SIZE
-            )
+            chunk_queue = self._start_capture(frames_per_buffer)
             
             print("🎤 Recording... (speak now)")
             frames = []
             
             # Record for specified duration
-            for _ in range(0, int(SAMPLE_RATE / CHUNK_SIZE * duration)):
+            for _ in range(int(_CHUNKS_PER_SECOND * duration)):
                 try:
-                    data = stream.read(CHUNK_SIZE, exception_on_overflow=False)
+                    data, _ = chunk_queue.get(timeout=_QUEUE_TIMEOUT)
                     frames.append(data)
+                except queue.Empty:
+                    logger.warning("No audio received from input device")
+                    print("⚠️  No audio received from input device")
+                    break
                 except Exception as e:
                     logger.warning(f"Warning during recording: {e}")
                     print(f"⚠️  Warning during recording: {e}")
@@ -143,13 +386,13 @@ class AudioRecorder:
             print("⏹️  Recording stopped")
             logger.info(f"Recorded {len(frames)} chunks")
             
-            # Stop and close stream
-            stream.stop_stream()
-            stream.close()
+            # Stop the stream; it stays open for the next recording
+            self._stop_capture()
             
             return frames
             
         except Exception as e:
+            self._close_stream()
             logger.error(f"Recording error: {e}")
             print(f"❌ Recording error: {e}")
             if "Invalid input device" in str(e) or "-9996" in str(e):
@@ -157,110 +400,149 @@ class AudioRecorder:
                 self.audio_manager._print_input_device_troubleshooting()
             return None
     
-    def record_with_vad(self) -> Optional[List[bytes]]:
-        """Record with enhanced Voice Activity Detection including pre-buffering"""
+    def _capture_chunk(self, samples: np.ndarray, write_idx: int) -> int:
+        """Copy a chunk into the capture buffer, returning the new write index"""
+        end = write_idx + samples.size
+        self._capture[write_idx:end] = samples
+        return end
+    
+    def record_with_vad(self, frames_per_buffer: Optional[int] = None) -> Optional[np.ndarray]:
+        """Record with enhanced Voice Activity Detection including pre-buffering
+        
+        frames_per_buffer sets the PortAudio read size (latency vs. CPU); VAD
+        decisions are still made on CHUNK_SIZE windows. Returns a view of the
+        recorder's capture buffer, valid until the next recording.
+        """
+        if frames_per_buffer is None:
+            frames_per_buffer = FRAMES_PER_BUFFER
+        
         if self.input_device_index is None:
             logger.error("No input device available for recording")
             print("❌ No input device available for recording")
             return None
             
         try:
-            # Open stream using AudioManager's PyAudio instance
-            stream = self.audio_manager.audio.open(
-                format=pyaudio.paInt16,
-                channels=CHANNELS,
-                rate=SAMPLE_RATE,
-                input=True,
-                input_device_index=self.input_device_index,
-                frames_per_buffer=CHUNK_SIZE
-            )
+            chunk_queue = self._start_capture(frames_per_buffer)
             
             # Calibrate ambient noise level for dynamic threshold
-            dynamic_threshold = self._calibrate_ambient_noise(stream)
+            dynamic_threshold = self._calibrate_ambient_noise(chunk_queue)
+            # The VAD loop works in the mean-square domain, so no sqrt per chunk
+            dynamic_threshold_sq = dynamic_threshold ** 2
+            exit_threshold_sq = (dynamic_threshold * _VAD_EXIT_RATIO) ** 2
+            
+            # Silero keeps context between calls; start each recording fresh
+            if self._speech_model is not None:
+                self._speech_model.reset_states()
             
             print("🎤 Recording... (speak now)")
             
             # Pre-buffer to capture audio before voice detection
-            pre_buffer_chunks = int(SAMPLE_RATE / CHUNK_SIZE * PRE_BUFFER_DURATION)
-            pre_buffer = []
-            all_frames = []
-            volume_history = []
+            pre_buffer = deque(maxlen=_PRE_BUFFER_CHUNKS)
+            write_idx = 0
+            volume_history = deque(maxlen=VOLUME_SMOOTHING_WINDOW)
+            vol_sum = 0.0
             silent_chunks = 0
             recording_started = False
-            total_recording_time = 0
+            speaking = False
+            recorded_chunks = 0
+            # User-facing status for why the loop ended, printed once it has exited
+            stop_message = None
+            
+            # Bound methods used every chunk, looked up once
+            get_chunk = chunk_queue.get
+            pre_buffer_append = pre_buffer.append
+            history_append = volume_history.append
+            is_speech = self._is_speech
+            capture_chunk = self._capture_chunk
             
             while True:
                 try:
-                    data = stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                    rms = self._calculate_rms(data)
+                    data, ms = get_chunk(timeout=_QUEUE_TIMEOUT)
                     
-                    # Apply volume smoothing
-                    smoothed_rms = self._smooth_volume(volume_history, rms)
+                    # Apply volume smoothing to reduce false triggers: the deque keeps
+                    # the last N levels and vol_sum tracks their total
+                    if len(volume_history) == VOLUME_SMOOTHING_WINDOW:
+                        vol_sum -= volume_history[0]
+                    history_append(ms)
+                    vol_sum += ms
+                    smoothed_ms = vol_sum / len(volume_history)
                     
-                    # Always add to pre-buffer (circular buffer)
-                    pre_buffer.append(data)
-                    if len(pre_buffer) > pre_buffer_chunks:
-                        pre_buffer.pop(0)
+                    # Always add to pre-buffer (circular buffer, oldest chunk drops off)
+                    pre_buffer_append(data)
                     
-                    # Check if sound is above dynamic threshold
-                    if smoothed_rms > dynamic_threshold:
+                    # Enter speech above the dynamic threshold, leave it only below the
+                    # lower exit threshold; the speech model only runs on chunks
+                    # that pass this cheap RMS gate
+                    if speaking:
+                        speaking = smoothed_ms >= exit_threshold_sq and is_speech(data)
+                    else:
+                        speaking = smoothed_ms > dynamic_threshold_sq and is_speech(data)
+                    
+                    if speaking:
                         if not recording_started:
-                            print("🔴 Voice detected, active recording...")
+                            if VERBOSE_MODE:
+                                print("🔴 Voice detected, active recording...")
                             logger.info("Voice activity detected, starting recording")
                             recording_started = True
                             # Add pre-buffered audio to capture speech that started before detection
-                            all_frames.extend(pre_buffer)
-                            pre_buffer = []  # Clear pre-buffer since we've used it
+                            for buffered in pre_buffer:
+                                write_idx = capture_chunk(buffered, write_idx)
+                            pre_buffer.clear()  # Clear pre-buffer since we've used it
                         
-                        all_frames.append(data)
+                        write_idx = capture_chunk(data, write_idx)
                         silent_chunks = 0
-                        total_recording_time += CHUNK_SIZE / SAMPLE_RATE
+                        recorded_chunks += 1
                     else:
                         if recording_started:
-                            all_frames.append(data)
+                            write_idx = capture_chunk(data, write_idx)
                             silent_chunks += 1
-                            total_recording_time += CHUNK_SIZE / SAMPLE_RATE
-                            
-                            # Check if we've been silent long enough to stop
-                            silence_duration = silent_chunks * CHUNK_SIZE / SAMPLE_RATE
+                            recorded_chunks += 1
                             
                             # Only stop if we've recorded for minimum duration and detected sufficient silence
-                            if (silence_duration >= SILENCE_DURATION and 
-                                total_recording_time >= MIN_RECORDING_DURATION):
-                                print("⏹️  Natural pause detected, stopping recording")
-                                logger.info(f"Recording stopped after {total_recording_time:.1f}s")
+                            if (silent_chunks >= _SILENCE_CHUNKS and 
+                                recorded_chunks >= _MIN_RECORDING_CHUNKS):
+                                stop_message = "⏹️  Natural pause detected, stopping recording"
+                                logger.info(f"Recording stopped after {recorded_chunks * _CHUNK_SECONDS:.1f}s")
                                 break
                     
                     # Safety check - don't record forever
-                    if total_recording_time > 30:  # 30 seconds max
-                        print("⏰ Maximum recording time reached")
+                    if recorded_chunks > _MAX_RECORDING_CHUNKS:
+                        stop_message = "⏰ Maximum recording time reached"
                         logger.warning("Maximum recording time reached")
                         break
                         
+                except queue.Empty:
+                    logger.warning("No audio received from input device")
+                    stop_message = "⚠️  No audio received from input device"
+                    break
                 except Exception as e:
                     logger.warning(f"Warning during VAD recording: {e}")
-                    print(f"⚠️  Warning during VAD recording: {e}")
+                    stop_message = f"⚠️  Warning during VAD recording: {e}"
                     break
             
-            stream.stop_stream()
-            stream.close()
+            self._stop_capture()
+            if stop_message:
+                print(stop_message)
             
-            if not all_frames:
+            total_recording_time = recorded_chunks * _CHUNK_SECONDS
+            
+            if write_idx == 0:
                 print("⚠️  No speech detected")
                 logger.info("No speech detected")
                 return None
             
             # Ensure minimum recording duration was met
-            if total_recording_time < MIN_RECORDING_DURATION:
+            if recorded_chunks < _MIN_RECORDING_CHUNKS:
                 print(f"⚠️  Recording too short ({total_recording_time:.1f}s), minimum is {MIN_RECORDING_DURATION}s")
                 logger.info(f"Recording too short: {total_recording_time:.1f}s")
                 return None
                 
             print(f"✅ Recording completed ({total_recording_time:.1f}s)")
-            logger.info(f"Recording completed: {total_recording_time:.1f}s, {len(all_frames)} chunks")
-            return all_frames
+            logger.info(f"Recording completed: {total_recording_time:.1f}s, {write_idx // (CHUNK_SIZE * CHANNELS)} chunks")
+            return self._capture[:write_idx]
             
         except Exception as e:
+            self._close_stream()
             logger.error(f"Recording with VAD error: {e}")
             print(f"❌ Recording with VAD error: {e}")
             if "Invalid input device" in str(e) or "-9996" in str(e):
@@ -268,20 +550,29 @@ class AudioRecorder:
                 self.audio_manager._print_input_device_troubleshooting()
             return None
     
-    def save_audio(self, frames: List[bytes], filename: Optional[str] = None) -> Optional[str]:
-        """Save recorded frames to a WAV file"""
-        if not frames:
+    def save_audio(self, frames: Union[List[bytes], List[np.ndarray], np.ndarray], filename: Optional[str] = None) -> Optional[str]:
+        """Save recorded frames (chunk list or int16 samples) to a WAV file"""
+        if frames is None or len(frames) == 0:
             return None
             
         if filename is None:
             filename = os.path.join(TEMP_AUDIO_DIR, TEMP_INPUT_FILE)
         
         try:
+            import wave
+            
+            chunks = [frames] if isinstance(frames, np.ndarray) else frames
+            total_bytes = sum(memoryview(chunk).nbytes for chunk in chunks)
+            
             with wave.open(filename, 'wb') as wf:
                 wf.setnchannels(CHANNELS)
-                wf.setsampwidth(self.audio_manager.audio.get_sample_size(pyaudio.paInt16))
+                wf.setsampwidth(_SAMPLE_WIDTH)
                 wf.setframerate(SAMPLE_RATE)
-                wf.writeframes(b''.join(frames))
+                # Declare the final size so the header is written once, then
+                # stream each chunk straight from its buffer without joining
+                wf.setnframes(total_bytes // (CHANNELS * _SAMPLE_WIDTH))
+                for chunk in chunks:
+                    wf.writeframesraw(chunk)
             
             logger.info(f"Audio saved to: {filename}")
             return filename
@@ -298,12 +589,27 @@ class AudioRecorder:
         else:
             frames = self.record_chunk()
         
-        if frames:
+        if frames is not None and len(frames) > 0:
             return self.save_audio(frames)
         return None
     
+    def record_float32(self, use_vad: bool = True) -> Optional[np.ndarray]:
+        """Record audio as float32 samples in [-1, 1), without writing a WAV file"""
+        if use_vad:
+            frames = self.record_with_vad()
+        else:
+            frames = self.record_chunk()
+        
+        if frames is None or len(frames) == 0:
+            return None
+        
+        samples = frames if isinstance(frames, np.ndarray) else np.concatenate(frames)
+        # Convert and scale in one pass; the result no longer aliases the capture buffer
+        return np.multiply(samples, np.float32(1.0 / 32768.0), dtype=np.float32)
+    
     def cleanup(self) -> None:
         """Clean up audio resources"""
+        self._close_stream()
         if self.audio_manager:
             self.audio_manager.cleanup()
         logger.info("AudioRecorder cleaned up")
@@ -45,6 +45,12 @@ CHUNK_SIZE = get_int_env('CHUNK_SIZE', 1024)
 SAMPLE_RATE = get_int_env('SAMPLE_RATE', 16000)
 CHANNELS = get_int_env('CHANNELS', 1)
 RECORD_DURATION = get_int_env('RECORD_DURATION', 4)
+# PortAudio block size in frames: smaller lowers latency, larger lowers CPU per block.
+# VAD still analyses CHUNK_SIZE windows regardless of this value; the default
+# delivers two windows per audio callback.
+FRAMES_PER_BUFFER = get_int_env('FRAMES_PER_BUFFER', CHUNK_SIZE * 2)
+# Capture through sounddevice (raw buffer callbacks) when installed, else PyAudio
+USE_SOUNDDEVICE = get_bool_env('USE_SOUNDDEVICE', True)
 AUDIO_FORMAT = os.getenv('AUDIO_FORMAT', 'wav')
 
 # Voice Activity Detection
@@ -54,6 +60,13 @@ MIN_RECORDING_DURATION = get_float_env('MIN_RECORDING_DURATION', 1.5)
 PRE_BUFFER_DURATION = get_float_env('PRE_BUFFER_DURATION', 2.0)
 VOLUME_SMOOTHING_WINDOW = get_int_env('VOLUME_SMOOTHING_WINDOW', 5)
 AMBIENT_NOISE_CALIBRATION_TIME = get_float_env('AMBIENT_NOISE_CALIBRATION_TIME', 1.0)
+# Neural speech detector (silero-vad) used on top of the RMS gate when installed
+USE_SILERO_VAD = get_bool_env('USE_SILERO_VAD', True)
+SILERO_VAD_THRESHOLD = get_float_env('SILERO_VAD_THRESHOLD', 0.5)
+
+# Audio Device Probe Cache (seconds before cached probe results expire; 0 disables)
+AUDIO_DEVICE_CACHE_TTL = get_int_env('AUDIO_DEVICE_CACHE_TTL', 86400)
+AUDIO_DEVICE_CACHE_FILE = Path(os.getenv('AUDIO_DEVICE_CACHE_FILE', str(Path.home() / '.cache' / 'voicechat' / 'audio_devices.json')))
 
 # Model Settings
 WHISPER_MODEL_SIZE = os.getenv('WHISPER_MODEL_SIZE', 'base')
@@ -73,9 +86,8 @@ VOICE_SAMPLE_PATH = BASE_DIR / os.getenv('VOICE_SAMPLE_PATH', 'voice-samples/sam
 TEMP_INPUT_FILE = "temp_input.wav"
 TEMP_OUTPUT_FILE = "temp_output.wav"
 
-# Ensure directories exist
-TEMP_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-AI_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+# Directories are created by the components that write to them
+# (AudioRecorder, VoiceChatApp, SpeechProcessor._save_ai_audio), not at import
 
 # Convert paths to strings for backward compatibility
 TEMP_AUDIO_DIR = str(TEMP_AUDIO_DIR)
@@ -89,6 +101,8 @@ EXIT_COMMANDS = get_list_env('EXIT_COMMANDS', ['exit', 'quit', 'stop', 'goodbye'
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY', '')
 OPENROUTER_MODEL = os.getenv('OPENROUTER_MODEL', 'openai/gpt-4')
 OPENROUTER_BASE_URL = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
+# Gzip large request bodies; only for endpoints known to accept Content-Encoding: gzip
+GZIP_REQUESTS = get_bool_env('GZIP_REQUESTS', False)
 
 # AI Personality & Behavior
 AI_SYSTEM_PROMPT = os.getenv(
@@ -107,6 +121,9 @@ AUDIO_QUALITY_CHECK = get_bool_env('AUDIO_QUALITY_CHECK', True)
 TTS_GENERATION_TIMEOUT = get_int_env('TTS_GENERATION_TIMEOUT', 30)
 AUDIO_MIN_FILE_SIZE = get_int_env('AUDIO_MIN_FILE_SIZE', 1024)
 AUDIO_VALIDATION_DELAY = get_float_env('AUDIO_VALIDATION_DELAY', 0.5)
+# Speak the AI reply sentence by sentence while it streams in, instead of
+# waiting for the whole reply before synthesizing it
+STREAM_TTS = get_bool_env('STREAM_TTS', True)
 
 # Application Settings
 SHOW_TRANSCRIPTION = get_bool_env('SHOW_TRANSCRIPTION', True)
@@ -133,6 +150,9 @@ def validate_config():
     if WHISPER_MODEL_SIZE not in ['tiny', 'base', 'small', 'medium', 'large-v3']:
         errors.append(f"Invalid WHISPER_MODEL_SIZE: {WHISPER_MODEL_SIZE}")
     
+    if FRAMES_PER_BUFFER <= 0:
+        errors.append(f"Invalid FRAMES_PER_BUFFER: {FRAMES_PER_BUFFER}. Must be positive.")
+    
     if SAMPLE_RATE not in [8000, 16000, 22050, 44100, 48000]:
         errors.append(f"Unusual SAMPLE_RATE: {SAMPLE_RATE}. Recommended: 16000")
     
@@ -3,16 +3,54 @@ AI Chat Module for Voice Chat Application
 Handles communication with OpenRouter API for conversational AI responses
 """
 
+import gzip
 import json
 import requests
 import time
 import logging
-from typing import List, Dict, Optional
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    # Fall back to the stdlib encoder when orjson is not installed
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
+
+try:
+    import msgspec
+    
+    # Typed views over the completion response that declare only the fields we
+    # read, so the decoder skips building dicts for everything else
+    class _CompletionMessage(msgspec.Struct):
+        content: Optional[str] = None
+    
+    class _CompletionChoice(msgspec.Struct):
+        message: _CompletionMessage
+    
+    class _Completion(msgspec.Struct):
+        choices: List[_CompletionChoice]
+    
+    _completion_decoder = msgspec.json.Decoder(_Completion)
+    
+    def _decode_completion_content(body: bytes) -> str:
+        return _completion_decoder.decode(body).choices[0].message.content or ""
+except ImportError:
+    def _decode_completion_content(body: bytes) -> str:
+        return _loads(body)["choices"][0]["message"]["content"] or ""
 
 from ..config import (
     OPENROUTER_API_KEY,
     OPENROUTER_MODEL,
     OPENROUTER_BASE_URL,
+    GZIP_REQUESTS,
     AI_SYSTEM_PROMPT,
     CONVERSATION_MEMORY_LENGTH,
     VERBOSE_MODE
@@ -20,17 +58,87 @@ from ..config import (
 
 logger = logging.getLogger(__name__)
 
+# Headers sent with every OpenRouter request (Authorization is added per instance)
+_STATIC_HEADERS = {
+    "Content-Type": "application/json",
+    "HTTP-Referer": "https://github.com/voice-chat-ai",
+    "X-Title": "Voice Chat AI"
+}
+
+# Fixed prompt used by AIChat.test_connection
+_TEST_MESSAGES = (
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "Say 'Hello' if you can hear me."}
+)
+
+# (connect, read) timeouts in seconds: fail fast when the host is unreachable,
+# but give the model time to produce (or keep streaming) its reply
+_REQUEST_TIMEOUT = (5, 30)
+
+# How long (seconds) a connection test result is reused before re-testing
+_CONNECTION_TEST_TTL = 60.0
+
+# With GZIP_REQUESTS on, request bodies above this size (bytes) are gzip-compressed
+_GZIP_MIN_BYTES = 1024
+_GZIP_HEADERS = {"Content-Encoding": "gzip"}
+
+
+def _compress_body(body: bytes) -> Tuple[bytes, Optional[Dict[str, str]]]:
+    """Gzip large request bodies if enabled, returning the body and any extra headers"""
+    if GZIP_REQUESTS and len(body) > _GZIP_MIN_BYTES:
+        # Level 1 costs next to no CPU and still shrinks chat JSON 2-3x
+        return gzip.compress(body, compresslevel=1), _GZIP_HEADERS
+    return body, None
+
 
 class AIChat:
     """Handles AI conversation using OpenRouter API"""
     
+    # Canned responses rotated through when the API call fails
+    _FALLBACKS: Tuple[str, ...] = (
+        "Sorry, I'm having trouble connecting right now. Could you try again?",
+        "Hmm, I didn't quite get that. Can you repeat it?",
+        "I'm having some technical difficulties. Let's try that again.",
+        "Oops, something went wrong on my end. What were you saying?"
+    )
+    
     def __init__(self):
-        self.conversation_history: List[Dict[str, str]] = []
         self.api_key = OPENROUTER_API_KEY
         self.model = OPENROUTER_MODEL
         self.base_url = OPENROUTER_BASE_URL
         self.system_prompt = AI_SYSTEM_PROMPT
         self.max_history = CONVERSATION_MEMORY_LENGTH
+        # History is stored already shaped as API messages (user/assistant pairs);
+        # the deque drops the oldest pair on its own once max_history is reached
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=2 * max(self.max_history, 0))
+        self._system_message = {"role": "system", "content": self.system_prompt}
+        self._completions_url = f"{self.base_url}/chat/completions"
+        self._auth_header = f"Bearer {self.api_key}"
+        self._fallback_idx = 0
+        self._last_test_ok: Optional[bool] = None
+        self._last_test_ts: float = 0.0
+        
+        # Reused across streams to collect the UTF-8 reply; cleared per stream
+        self._stream_buf = bytearray()
+        
+        # Persistent session so every turn reuses the same keep-alive connection
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=2,
+                connect=0,  # Unreachable host: fail within the connect timeout, no backoff retries
+                read=False,  # A POST whose reply stalled may already be billed; never resend it
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=None,  # Also retry POST on rate limits / gateway errors
+                raise_on_status=False  # Hand back the last error response once retries run out
+            )
+        ))
+        # Headers never change after construction, so set them on the session once
+        self._session.headers.update(_STATIC_HEADERS)
+        self._session.headers["Authorization"] = self._auth_header
         
         # Validate API key
         if self.api_key == "your-api-key-here" or not self.api_key:
@@ -45,59 +153,22 @@ class AIChat:
     
     def add_to_history(self, user_message: str, ai_response: str) -> None:
         """Add a message exchange to conversation history"""
-        self.conversation_history.append({
-            "user": user_message,
-            "assistant": ai_response
-        })
-        
-        # Keep only the last N exchanges
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history = self.conversation_history[-self.max_history:]
+        self.conversation_history.append({"role": "user", "content": user_message})
+        self.conversation_history.append({"role": "assistant", "content": ai_response})
             
         if VERBOSE_MODE:
-            logger.debug(f"Added to history. Total exchanges: {len(self.conversation_history)}")
+            logger.debug(f"Added to history. Total exchanges: {len(self.conversation_history) // 2}")
     
     def build_messages(self, user_input: str) -> List[Dict[str, str]]:
         """Build the messages array for the API call"""
-        messages = []
-        
-        # Add system prompt
-        messages.append({
-            "role": "system",
-            "content": self.system_prompt
-        })
-        
-        # Add conversation history
-        for exchange in self.conversation_history:
-            messages.append({
-                "role": "user",
-                "content": exchange["user"]
-            })
-            messages.append({
-                "role": "assistant",
-                "content": exchange["assistant"]
-            })
-        
-        # Add current user input
-        messages.append({
-            "role": "user",
-            "content": user_input
-        })
-        
-        return messages
-    
-    def call_openrouter_api(self, messages: List[Dict[str, str]]) -> Optional[str]:
-        """Make API call to OpenRouter"""
-        if not self.api_configured:
-            return None
-        
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/voice-chat-ai",
-            "X-Title": "Voice Chat AI"
-        }
-        
+        return [
+            self._system_message,
+            *self.conversation_history,
+            {"role": "user", "content": user_input}
+        ]
+    
+    def _build_payload(self, messages: List[Dict[str, str]], stream: bool = False) -> Dict:
+        """Build the request body for a chat completion"""
         payload = {
             "model": self.model,
             "messages": messages,
@@ -105,21 +176,58 @@ class AIChat:
             "max_tokens": 150,  # Keep responses concise for speech
             "top_p": 0.9
         }
+        if stream:
+            payload["stream"] = True
+        return payload
+    
+    def _build_payload_bytes(self, user_input: str, stream: bool = False) -> bytes:
+        """Serialize the request body for user_input straight from the stored history
+        
+        The messages list only exists inside the encoder call, so no separate
+        build_messages pass is needed on the get_response hot path.
+        """
+        return _dumps(self._build_payload(
+            [self._system_message, *self.conversation_history, {"role": "user", "content": user_input}],
+            stream
+        ))
+    
+    def call_openrouter_api(
+        self,
+        messages: List[Dict[str, str]],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """Make API call to OpenRouter
+        
+        When on_delta is given the completion is streamed and each text delta
+        is passed to it as soon as it arrives.
+        """
+        if on_delta is None:
+            return self._post_completion(_dumps(self._build_payload(messages)))
+        
+        for delta in self._stream_completion(_dumps(self._build_payload(messages, stream=True))):
+            on_delta(delta)
+        ai_response = self._take_stream_text()
+        return ai_response or None
+    
+    def _post_completion(self, body: bytes) -> Optional[str]:
+        """Send an encoded completion request and return the reply text"""
+        if not self.api_configured:
+            return None
         
         try:
             if VERBOSE_MODE:
                 logger.info(f"Calling OpenRouter API with model: {self.model}")
             
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
+            data, headers = _compress_body(body)
+            response = self._session.post(
+                self._completions_url,
+                data=data,
                 headers=headers,
-                json=payload,
-                timeout=30
+                timeout=_REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                data = response.json()
-                ai_response = data["choices"][0]["message"]["content"].strip()
+                ai_response = _decode_completion_content(response.content).strip()
                 
                 if VERBOSE_MODE:
                     logger.info("OpenRouter API call successful")
@@ -147,6 +255,83 @@ class AIChat:
             print(f"❌ {error_msg}")
             return None
     
+    def _stream_completion(self, body: bytes) -> Iterator[str]:
+        """Send an encoded streaming request, yielding text deltas as they arrive
+        
+        The full reply is also collected in _stream_buf; read it with
+        _take_stream_text once the stream is exhausted.
+        """
+        self._stream_buf.clear()
+        if not self.api_configured:
+            return
+        
+        try:
+            if VERBOSE_MODE:
+                logger.info(f"Streaming from OpenRouter API with model: {self.model}")
+            
+            data, headers = _compress_body(body)
+            response = self._session.post(
+                self._completions_url,
+                data=data,
+                headers=headers,
+                timeout=_REQUEST_TIMEOUT,
+                stream=True
+            )
+            
+            with response:
+                if response.status_code != 200:
+                    error_msg = f"OpenRouter API error: {response.status_code}"
+                    logger.error(f"{error_msg} - {response.text}")
+                    print(f"❌ {error_msg}")
+                    return
+                
+                for line in response.iter_lines():
+                    # Skip blank separators and SSE comments such as ": OPENROUTER PROCESSING"
+                    if not line.startswith(b"data: "):
+                        continue
+                    data = line[6:]
+                    if data == b"[DONE]":
+                        break
+                    
+                    event = _loads(data)
+                    if "error" in event:
+                        raise RuntimeError(event["error"].get("message", event["error"]))
+                    
+                    choices = event.get("choices")
+                    if choices:
+                        delta = choices[0].get("delta", {}).get("content")
+                        if delta:
+                            self._stream_buf += delta.encode("utf-8")
+                            yield delta
+            
+            if VERBOSE_MODE:
+                logger.info("OpenRouter API stream completed")
+                
+        except requests.exceptions.Timeout:
+            error_msg = "OpenRouter API timeout"
+            logger.error(error_msg)
+            print(f"❌ {error_msg}")
+        except requests.exceptions.RequestException as e:
+            error_msg = f"OpenRouter API request error: {e}"
+            logger.error(error_msg)
+            print(f"❌ {error_msg}")
+        except Exception as e:
+            error_msg = f"Unexpected error streaming from OpenRouter API: {e}"
+            logger.error(error_msg)
+            print(f"❌ {error_msg}")
+    
+    def _take_stream_text(self) -> str:
+        """Decode the reply collected by the last stream and reset the buffer"""
+        text = self._stream_buf.decode("utf-8").strip()
+        self._stream_buf.clear()
+        return text
+    
+    def _fallback_response(self) -> str:
+        """Pick the next canned response for when the API call fails"""
+        fallback = self._FALLBACKS[self._fallback_idx % len(self._FALLBACKS)]
+        self._fallback_idx += 1
+        return fallback
+    
     def get_response(self, user_input: str) -> str:
         """Get AI response for user input"""
         if not user_input or user_input.strip() == "":
@@ -158,36 +343,53 @@ class AIChat:
         if VERBOSE_MODE:
             logger.debug(f"Getting AI response for: '{user_input}'")
         
-        # Build messages for API call
-        messages = self.build_messages(user_input)
-        
         # Call OpenRouter API
-        ai_response = self.call_openrouter_api(messages)
+        ai_response = self._post_completion(self._build_payload_bytes(user_input))
         
         if ai_response:
             # Add to conversation history
             self.add_to_history(user_input, ai_response)
             return ai_response
         else:
-            # Fallback response if API fails
-            fallback_responses = [
-                "Sorry, I'm having trouble connecting right now. Could you try again?",
-                "Hmm, I didn't quite get that. Can you repeat it?",
-                "I'm having some technical difficulties. Let's try that again.",
-                "Oops, something went wrong on my end. What were you saying?"
-            ]
-            
-            # Use a simple rotation based on history length
-            fallback_index = len(self.conversation_history) % len(fallback_responses)
-            fallback = fallback_responses[fallback_index]
-            
-            # Still add to history for context
+            # Fallback response if API fails, still added to history for context
+            fallback = self._fallback_response()
             self.add_to_history(user_input, fallback)
             return fallback
     
+    def get_response_stream(self, user_input: str) -> Iterator[str]:
+        """Get AI response for user input as a stream of text deltas
+        
+        Lets the caller (e.g. TTS) start consuming the reply before the last
+        token arrives. History is updated once the stream has finished, or with
+        the partial reply if the caller closes the stream early.
+        """
+        if not user_input or user_input.strip() == "":
+            yield "I didn't catch that. Could you say something?"
+            return
+        
+        # Clean up the input
+        user_input = user_input.strip()
+        
+        if VERBOSE_MODE:
+            logger.debug(f"Streaming AI response for: '{user_input}'")
+        
+        try:
+            yield from self._stream_completion(self._build_payload_bytes(user_input, stream=True))
+        finally:
+            # Also runs on close(), which ends the HTTP stream mid-reply
+            ai_response = self._take_stream_text()
+            if ai_response:
+                self.add_to_history(user_input, ai_response)
+        
+        if not ai_response:
+            # Fallback response if API fails, still added to history for context
+            fallback = self._fallback_response()
+            self.add_to_history(user_input, fallback)
+            yield fallback
+    
     def clear_history(self) -> None:
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
         if VERBOSE_MODE:
             logger.info("Conversation history cleared")
             print("🧹 Conversation history cleared")
@@ -197,30 +399,66 @@ class AIChat:
         if not self.conversation_history:
             return "No conversation history"
         
-        summary = f"Conversation history ({len(self.conversation_history)} exchanges):\n"
-        for i, exchange in enumerate(self.conversation_history, 1):
-            user_text = exchange['user'][:50] + "..." if len(exchange['user']) > 50 else exchange['user']
-            ai_text = exchange['assistant'][:50] + "..." if len(exchange['assistant']) > 50 else exchange['assistant']
-            summary += f"  {i}. User: {user_text}\n"
-            summary += f"     AI: {ai_text}\n"
+        history = self.conversation_history
+        parts = [f"Conversation history ({len(history) // 2} exchanges):\n"]
+        messages = iter(history)
+        for i, (user_message, ai_message) in enumerate(zip(messages, messages), 1):
+            user_content = user_message['content']
+            ai_content = ai_message['content']
+            user_text = user_content[:50] + "..." if len(user_content) > 50 else user_content
+            ai_text = ai_content[:50] + "..." if len(ai_content) > 50 else ai_content
+            parts.append(f"  {i}. User: {user_text}\n     AI: {ai_text}\n")
         
-        return summary
+        return "".join(parts)
     
-    def test_connection(self) -> bool:
-        """Test the OpenRouter API connection"""
+    def warm_up(self) -> None:
+        """Open the keep-alive connection ahead of the first turn
+        
+        A bodiless HEAD request resolves DNS and completes the TCP/TLS handshake,
+        so the first completion goes out on a ready pooled connection.
+        """
+        # Runs on a background thread; close() may clear _session meanwhile
+        session = self._session
+        if not self.api_configured or session is None:
+            return
+        
+        try:
+            session.head(self._completions_url, timeout=_REQUEST_TIMEOUT)
+            logger.debug("OpenRouter connection warmed up")
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"OpenRouter connection warm-up failed: {e}")
+    
+    def test_connection(self, force: bool = False) -> bool:
+        """Test the OpenRouter API connection
+        
+        A result from the last minute is reused unless force is set.
+        """
         if not self.api_configured:
             print("❌ API key not configured")
             return False
         
-        test_messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": "Say 'Hello' if you can hear me."}
-        ]
+        if (not force and self._last_test_ok is not None and
+                time.monotonic() - self._last_test_ts < _CONNECTION_TEST_TTL):
+            logger.debug(f"Reusing cached connection test result: {self._last_test_ok}")
+            return self._last_test_ok
+        
+        response = self.call_openrouter_api(list(_TEST_MESSAGES))
+        self._last_test_ok = bool(response)
+        self._last_test_ts = time.monotonic()
         
-        response = self.call_openrouter_api(test_messages)
         if response:
             print(f"✅ OpenRouter connection test successful: {response}")
-            return True
         else:
             print("❌ OpenRouter connection test failed")
-            return False
+        return self._last_test_ok
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        session = getattr(self, "_session", None)
+        if session is not None:
+            session.close()
+            self._session = None
+    
+    def __del__(self):
+        """Destructor to ensure cleanup"""
+        self.close()
@@ -4,15 +4,20 @@ Handles speech-to-text and text-to-speech operations
 """
 
 import os
+import re
 import sys
 import warnings
 import pygame
 import time
+import wave
 import shutil
+import queue
 import logging
+import threading
+import numpy as np
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Generator, Iterable, Iterator, List, Optional, Tuple, Union
 
 from ..config import (
     SAMPLE_RATE, CHANNELS, TEMP_AUDIO_DIR, TEMP_OUTPUT_FILE,
@@ -22,7 +27,7 @@ from ..config import (
     TTS_GENERATION_TIMEOUT, AUDIO_MIN_FILE_SIZE, AUDIO_VALIDATION_DELAY,
     SAVE_AI_AUDIO, AI_AUDIO_DIR, AI_AUDIO_FILENAME_FORMAT,
     MAX_SAVED_AUDIO_FILES, SHOW_TRANSCRIPTION, SHOW_AI_RESPONSE,
-    CLEANUP_ON_EXIT, VERBOSE_MODE
+    STREAM_TTS, CLEANUP_ON_EXIT, VERBOSE_MODE
 )
 from .ai_chat import AIChat
 
@@ -31,6 +36,65 @@ warnings.filterwarnings("ignore")
 
 logger = logging.getLogger(__name__)
 
+# Streamed replies: synthesized sentences waiting for playback, and the number
+# of per-sentence output files cycled through (queued, in synthesis, playing,
+# and the one just played, which the mixer may still hold open)
+_SENTENCE_QUEUE_DEPTH = 2
+_SENTENCE_FILES = _SENTENCE_QUEUE_DEPTH + 3
+
+# A candidate sentence end: terminal punctuation (plus any closing quote or
+# bracket) with whitespace and the next word's first character, or a line break
+_SENTENCE_BREAK = re.compile(r'([.!?]+)["\')\]]*\s+(?=(\S))|\n+')
+
+# Words whose trailing period does not end a sentence
+_ABBREVIATIONS = frozenset({
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'mt', 'vs', 'etc',
+    'e.g', 'i.e', 'approx', 'dept', 'fig', 'inc', 'ltd', 'jan', 'feb', 'apr',
+    'jun', 'jul', 'aug', 'sept', 'oct', 'nov', 'dec'
+})
+
+
+def _sentence_file(index: int) -> str:
+    """Output path for the index-th sentence of a streamed reply"""
+    stem, ext = os.path.splitext(TEMP_OUTPUT_FILE)
+    return os.path.join(TEMP_AUDIO_DIR, f"{stem}_{index % _SENTENCE_FILES}{ext}")
+
+
+def _iter_sentences(pieces: Iterable[str]) -> Iterator[str]:
+    """Yield complete sentences from text that arrives in pieces
+    
+    A sentence is yielded as soon as the first character after its break has
+    arrived, so streamed replies can be spoken before the rest is generated.
+    """
+    pending = ""
+    for piece in pieces:
+        pending += piece
+        start = 0
+        for match in _SENTENCE_BREAK.finditer(pending):
+            # Punctuation followed by a lowercase word does not end the sentence,
+            # and neither does the period of an abbreviation or initial
+            end = match.group(1)
+            if end and (match.group(2).islower() or
+                        (set(end) == {'.'} and _is_abbreviation(pending[start:match.start()]))):
+                continue
+            sentence = pending[start:match.end()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        pending = pending[start:]
+    
+    # Whatever follows the last break (usually an unpunctuated ending)
+    tail = pending.strip()
+    if tail:
+        yield tail
+
+
+def _is_abbreviation(text: str) -> bool:
+    """Whether the period ending text belongs to an abbreviation or an initial"""
+    words = text.split()
+    word = words[-1].lstrip('"\'([').lower() if words else ''
+    return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
 
 class SpeechProcessor:
     """Handles speech-to-text and text-to-speech operations"""
@@ -41,6 +105,9 @@ class SpeechProcessor:
         self.pygame_initialized = False
         self.ai_chat = None
         
+        # Synthesized speech is written here; settings no longer create it at import
+        Path(TEMP_AUDIO_DIR).mkdir(parents=True, exist_ok=True)
+        
         # Initialize pygame mixer for audio playback
         self._init_pygame()
         
@@ -77,6 +144,8 @@ class SpeechProcessor:
         """Initialize AI chat component"""
         try:
             self.ai_chat = AIChat()
+            # Connect to OpenRouter in the background while the speech models load
+            threading.Thread(target=self.ai_chat.warm_up, daemon=True).start()
             if VERBOSE_MODE:
                 logger.info("AI chat initialized")
                 print("✅ AI chat initialized")
@@ -156,8 +225,8 @@ class SpeechProcessor:
             logger.error("Failed to load one or more speech models")
             return False
     
-    def transcribe_audio(self, audio_file: str) -> Optional[str]:
-        """Transcribe audio file to text using FastWhisper"""
+    def transcribe_audio(self, audio: Union[str, np.ndarray]) -> Optional[str]:
+        """Transcribe an audio file or 16 kHz mono float32 samples to text using FastWhisper"""
         if not self.whisper_model:
             logger.error("Whisper model not loaded")
             print("❌ Whisper model not loaded")
@@ -167,10 +236,13 @@ class SpeechProcessor:
             if VERBOSE_MODE:
                 print("🔄 Transcribing audio...")
             
-            logger.info(f"Transcribing audio file: {audio_file}")
+            if isinstance(audio, str):
+                logger.info(f"Transcribing audio file: {audio}")
+            else:
+                logger.info(f"Transcribing {audio.size / SAMPLE_RATE:.1f}s of recorded audio")
             
-            # Transcribe the audio file
-            segments, info = self.whisper_model.transcribe(audio_file, beam_size=5)
+            # Samples go straight to the model, skipping the WAV decode
+            segments, info = self.whisper_model.transcribe(audio, beam_size=5)
             
             # Extract text from segments
             transcribed_text = ""
@@ -228,30 +300,19 @@ class SpeechProcessor:
             start_time = time.time()
             
             # Generate speech
-            if XTTS_VOICE_SAMPLE and os.path.exists(XTTS_VOICE_SAMPLE):
+            if self._use_voice_clone():
                 # Use voice cloning if sample is available
                 print("🦜 Using cloned voice...")
                 logger.info("Using voice cloning")
-                self.tts_model.tts_to_file(
-                    text=text,
-                    speaker_wav=XTTS_VOICE_SAMPLE,
-                    language=XTTS_LANGUAGE,
-                    file_path=output_file
-                )
             else:
                 print("⚠️ Using default voice...")
                 logger.info("Using default voice")
-                # Use default voice
-                self.tts_model.tts_to_file(
-                    text=text,
-                    file_path=output_file
-                )
+            self._tts_to_file(text, output_file)
             
             processing_time = time.time() - start_time
             
             # Calculate real-time factor
             if os.path.exists(output_file):
-                import wave
                 try:
                     with wave.open(output_file, 'rb') as wf:
                         audio_duration = wf.getnframes() / wf.getframerate()
@@ -290,13 +351,133 @@ class SpeechProcessor:
             print(f"❌ {error_msg}")
             return None
     
+    def _use_voice_clone(self) -> bool:
+        """Whether a voice sample is available for XTTS voice cloning"""
+        return bool(XTTS_VOICE_SAMPLE and os.path.exists(XTTS_VOICE_SAMPLE))
+    
+    def _tts_to_file(self, text: str, output_file: str) -> None:
+        """Run XTTS on text, cloning the voice sample when there is one"""
+        if self._use_voice_clone():
+            self.tts_model.tts_to_file(
+                text=text,
+                speaker_wav=XTTS_VOICE_SAMPLE,
+                language=XTTS_LANGUAGE,
+                file_path=output_file
+            )
+        else:
+            # Use default voice
+            self.tts_model.tts_to_file(
+                text=text,
+                file_path=output_file
+            )
+    
+    def _synthesize_sentences(self, deltas: Generator[str, None, None], spoken: List[str],
+                              takes: List[Tuple[tuple, bytes]],
+                              ready: "queue.Queue[Optional[str]]", stop: threading.Event) -> None:
+        """Synthesize streamed sentences into rotating files and queue them for playback
+        
+        Runs on a worker thread; a None in the queue marks the end of the reply.
+        With SAVE_AI_AUDIO, each sentence's WAV params and frames go into takes.
+        """
+        try:
+            for i, sentence in enumerate(_iter_sentences(deltas)):
+                if stop.is_set():
+                    break
+                spoken.append(sentence)
+                if VERBOSE_MODE:
+                    print(f" > Synthesizing: {sentence}")
+                output_file = _sentence_file(i)
+                self._tts_to_file(sentence, output_file)
+                if SAVE_AI_AUDIO:
+                    # Read now, before the rotating file is reused
+                    with wave.open(output_file, 'rb') as wf:
+                        takes.append((wf.getparams(), wf.readframes(wf.getnframes())))
+                # Blocks while the player is _SENTENCE_QUEUE_DEPTH sentences behind
+                ready.put(output_file)
+        except Exception as e:
+            logger.error(f"Streaming speech synthesis error: {e}")
+            print(f"❌ Speech synthesis error: {e}")
+        finally:
+            # Ends the HTTP stream if the reply was cut short; the partial
+            # reply still goes into the chat history
+            deltas.close()
+            if not stop.is_set():
+                ready.put(None)
+    
+    def speak_streamed_response(self, user_input: str) -> Optional[str]:
+        """Get the AI reply as a stream and speak it sentence by sentence
+        
+        The next sentence is synthesized while the current one plays, and the
+        model keeps generating meanwhile. Returns the full reply, or None if
+        nothing could be played.
+        """
+        if not self.tts_model:
+            logger.error("TTS model not loaded")
+            print("❌ TTS model not loaded")
+            return None
+        
+        if self._use_voice_clone():
+            print("🦜 Using cloned voice...")
+        
+        spoken: List[str] = []
+        takes: List[Tuple[tuple, bytes]] = []
+        ready: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=_SENTENCE_QUEUE_DEPTH)
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=self._synthesize_sentences,
+            args=(self.ai_chat.get_response_stream(user_input), spoken, takes, ready, stop),
+            daemon=True
+        )
+        worker.start()
+        
+        played = 0
+        failed = False
+        try:
+            while True:
+                audio_file = ready.get()
+                if audio_file is None:
+                    break
+                if self.play_audio(audio_file):
+                    played += 1
+                else:
+                    failed = True
+        finally:
+            if worker.is_alive():
+                # Playback was interrupted: let the worker stop at the next
+                # sentence and close the stream, unblocking it if the queue is full
+                stop.set()
+                try:
+                    ready.get_nowait()
+                except queue.Empty:
+                    pass
+        worker.join()
+        
+        # The whole reply is saved as one file, like a non-streamed one
+        if takes:
+            self._save_ai_audio(self._join_takes(takes))
+        
+        if not played:
+            return None
+        if failed:
+            logger.warning("Some sentences of the reply could not be played")
+        return " ".join(spoken)
+    
     def _split_text_to_sentences(self, text: str) -> List[str]:
         """Split text into sentences for better TTS processing"""
-        import re
-        # Simple sentence splitting - can be improved with more sophisticated NLP
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        return sentences
+        return list(_iter_sentences((text,)))
+    
+    def _join_takes(self, takes: List[Tuple[tuple, bytes]]) -> Optional[str]:
+        """Write the sentence takes of a streamed reply into the temp output file"""
+        output_file = os.path.join(TEMP_AUDIO_DIR, TEMP_OUTPUT_FILE)
+        try:
+            with wave.open(output_file, 'wb') as wf:
+                wf.setparams(takes[0][0])
+                for _, frames in takes:
+                    wf.writeframes(frames)
+            return output_file
+        except Exception as e:
+            logger.warning(f"Could not join streamed reply audio: {e}")
+            return None
     
     def _validate_audio_file(self, audio_file: str) -> bool:
         """Validate that the audio file was generated correctly"""
@@ -466,11 +647,11 @@ class SpeechProcessor:
             print(f"❌ {error_msg}")
             return False
     
-    def process_speech_cycle(self, audio_file: str) -> str:
+    def process_speech_cycle(self, audio: Union[str, np.ndarray]) -> str:
         """Complete speech processing cycle: transcribe -> get AI response -> synthesize -> play"""
         # Step 1: Transcribe audio to text
         print("📝 Transcribing...")
-        transcribed_text = self.transcribe_audio(audio_file)
+        transcribed_text = self.transcribe_audio(audio)
         
         if not transcribed_text:
             print("⚠️  No speech detected or transcription failed")
@@ -484,11 +665,32 @@ class SpeechProcessor:
         logger.info(f"Transcribed: {transcribed_text}")
         
         # Check for exit commands
-        if any(exit_cmd in transcribed_text.lower() for exit_cmd in EXIT_COMMANDS):
+        # Commands match as substrings, so a set lookup cannot replace the scan;
+        # lowercase the text once rather than once per command
+        text_lower = transcribed_text.lower()
+        if any(exit_cmd in text_lower for exit_cmd in EXIT_COMMANDS):
             print("👋 Exit command detected")
             logger.info("Exit command detected")
             return "exit"
         
+        # Steps 2-4 overlapped: speak the reply while it is still being generated
+        if self.ai_chat and STREAM_TTS:
+            print("🤖 Getting AI response...")
+            ai_response = self.speak_streamed_response(transcribed_text)
+            
+            if not ai_response:
+                print("❌ Speech synthesis failed")
+                logger.error("Streamed speech synthesis failed")
+                return False
+            
+            if SHOW_AI_RESPONSE:
+                print(f"🤖 AI responds: \"{ai_response}\"")
+            
+            logger.info(f"AI response: {ai_response}")
+            print("✅ Speech cycle completed")
+            logger.info("Speech cycle completed successfully")
+            return True
+        
         # Step 2: Get AI response
         print("🤖 Getting AI response...")
         if self.ai_chat:
@@ -536,6 +738,9 @@ class SpeechProcessor:
         except Exception as e:
             logger.warning(f"Error cleaning up pygame: {e}")
         
+        if self.ai_chat:
+            self.ai_chat.close()
+        
         # Clean up temporary files if enabled
         if CLEANUP_ON_EXIT:
             self._cleanup_temp_files()
@@ -546,6 +751,7 @@ class SpeechProcessor:
             os.path.join(TEMP_AUDIO_DIR, "temp_input.wav"),
             os.path.join(TEMP_AUDIO_DIR, TEMP_OUTPUT_FILE)
         ]
+        temp_files.extend(_sentence_file(i) for i in range(_SENTENCE_FILES))
         
         for file in temp_files:
             try:
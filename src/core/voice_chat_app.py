@@ -25,6 +25,10 @@ from .speech_processor import SpeechProcessor
 
 logger = logging.getLogger(__name__)
 
+# faster-whisper accepts 16 kHz mono float32 samples directly; any other
+# capture format goes through the WAV file so the model can resample it
+_DIRECT_TRANSCRIPTION = SAMPLE_RATE == 16000 and CHANNELS == 1
+
 
 class VoiceChatApp:
     """Main Voice Chat Application"""
@@ -175,15 +179,18 @@ class VoiceChatApp:
                     logger.info(f"Starting cycle {cycle_count}")
                     
                     # Step 1: Record audio
-                    audio_file = self.recorder.record_and_save(use_vad=True)
+                    if _DIRECT_TRANSCRIPTION:
+                        audio = self.recorder.record_float32(use_vad=True)
+                    else:
+                        audio = self.recorder.record_and_save(use_vad=True)
                     
-                    if not audio_file:
+                    if audio is None:
                         print("⚠️  No audio recorded, trying again...")
                         logger.warning("No audio recorded in cycle")
                         continue
                     
                     # Step 2: Process the speech (transcribe -> synthesize -> play)
-                    result = self.processor.process_speech_cycle(audio_file)
+                    result = self.processor.process_speech_cycle(audio)
                     
                     if result == "exit":
                         print("👋 Exit command detected, goodbye!")
@@ -0,0 +1,62 @@
+"""
+Test file for the chunk level helpers in audio/recorder.py
+Checks the float64 dot mean square against exact integer arithmetic
+"""
+
+import os
+import sys
+import queue
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the repository root to path so the src package resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from src.audio import recorder
+except ImportError:
+    # PyAudio (or another capture dependency) is not installed
+    recorder = None
+
+
+@unittest.skipUnless(recorder is not None, "needs pyaudio")
+class TestChunkLevels(unittest.TestCase):
+    """Test cases for the capture-side chunk levels"""
+    
+    def setUp(self):
+        """Set up a loud and a quiet chunk"""
+        rng = np.random.default_rng(0)
+        self.loud = rng.integers(-20000, 20000, recorder._CHUNK_SAMPLES).astype(np.int16)
+        self.quiet = rng.integers(-40, 40, recorder._CHUNK_SAMPLES).astype(np.int16)
+    
+    def reference_mean_square(self, samples):
+        """Mean square computed exactly with Python integers"""
+        return sum(int(x) * int(x) for x in samples) / samples.size
+    
+    def test_mean_square_matches_reference(self):
+        """The float64 dot is exact for int16 chunks, including full scale"""
+        full_scale = np.full(recorder._CHUNK_SAMPLES, -32768, dtype=np.int16)
+        for samples in (self.loud, self.quiet, full_scale):
+            self.assertEqual(recorder._mean_square_int16(samples), self.reference_mean_square(samples))
+        self.assertEqual(recorder._mean_square_int16(np.empty(0, dtype=np.int16)), 0.0)
+    
+    def test_queue_samples_levels(self):
+        """The capture callback queues every chunk with its level"""
+        state = SimpleNamespace(
+            _pending=np.empty(0, dtype=np.int16),
+            _chunk_queue=queue.Queue()
+        )
+        block = np.concatenate((self.loud, self.quiet, self.loud[:10]))
+        recorder.AudioRecorder._queue_samples(state, block)
+        
+        levels = [state._chunk_queue.get_nowait()[1] for _ in range(2)]
+        self.assertTrue(state._chunk_queue.empty())
+        self.assertEqual(state._pending.size, 10)
+        self.assertEqual(levels, [self.reference_mean_square(self.loud),
+                                  self.reference_mean_square(self.quiet)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Test file for streamed sentence splitting in core/speech_processor.py
+Covers the sentence rules and the sentence-by-sentence TTS pipeline
+"""
+
+import os
+import sys
+import wave
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the repository root to path so the src package resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from src.core import speech_processor
+except ImportError:
+    # pygame (or another speech dependency) is not installed
+    speech_processor = None
+
+REPLIES = [
+    "Hi Dr. Smith, meet Mrs. Jones. She says hello!",
+    "J. R. R. Tolkien wrote it. Read it?",
+    "It costs approx. 3.5 dollars... really cheap. Deal.",
+    "\"Is it done?\" he asked. Yes (mostly.) Next line\nLast line",
+    "No final punctuation here",
+]
+
+
+@unittest.skipUnless(speech_processor is not None, "needs pygame")
+class TestIterSentences(unittest.TestCase):
+    """Test cases for _iter_sentences"""
+    
+    def split(self, text):
+        """Split a whole string in one piece"""
+        return list(speech_processor._iter_sentences((text,)))
+    
+    def test_abbreviations_stay_in_sentence(self):
+        """Known abbreviations do not end a sentence"""
+        self.assertEqual(self.split(REPLIES[0]),
+                         ["Hi Dr. Smith, meet Mrs. Jones.", "She says hello!"])
+    
+    def test_initials_stay_in_sentence(self):
+        """Single-letter initials do not end a sentence"""
+        self.assertEqual(self.split(REPLIES[1]), ["J. R. R. Tolkien wrote it.", "Read it?"])
+    
+    def test_lowercase_continues_sentence(self):
+        """Punctuation followed by a lowercase word, and decimals, do not split"""
+        self.assertEqual(self.split(REPLIES[2]),
+                         ["It costs approx. 3.5 dollars... really cheap.", "Deal."])
+    
+    def test_quotes_brackets_and_line_breaks(self):
+        """Closing quotes and brackets stay with their sentence; line breaks split"""
+        self.assertEqual(self.split(REPLIES[3]),
+                         ["\"Is it done?\" he asked.", "Yes (mostly.)", "Next line", "Last line"])
+    
+    def test_unpunctuated_tail(self):
+        """Text after the last break is yielded at the end"""
+        self.assertEqual(self.split(REPLIES[4]), ["No final punctuation here"])
+        self.assertEqual(self.split("   "), [])
+    
+    def test_pieces_match_whole_text(self):
+        """Any split into pieces gives the same sentences as the whole string"""
+        for text in REPLIES:
+            whole = self.split(text)
+            for size in (1, 2, 3, 5, 8):
+                pieces = [text[i:i + size] for i in range(0, len(text), size)]
+                self.assertEqual(list(speech_processor._iter_sentences(pieces)), whole,
+                                 f"piece size {size}: {text!r}")
+    
+    def test_sentence_yielded_before_stream_ends(self):
+        """A sentence is available once the next word has started arriving"""
+        consumed = []
+        
+        def pieces():
+            for piece in ("First one. ", "S", "econd one."):
+                consumed.append(piece)
+                yield piece
+        
+        sentences = speech_processor._iter_sentences(pieces())
+        self.assertEqual(next(sentences), "First one.")
+        self.assertEqual(len(consumed), 2)
+        self.assertEqual(list(sentences), ["Second one."])
+
+
+class _FakeTTS:
+    """Writes a short WAV per sentence, optionally failing on one"""
+    
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+    
+    def tts_to_file(self, text, file_path, **kwargs):
+        if text == self.fail_on:
+            raise RuntimeError("synthesis failed")
+        with wave.open(file_path, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\x01\x00" * 100)
+
+
+class _FakeChat:
+    """Streams a fixed reply and records whether the stream was closed"""
+    
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.closed = False
+    
+    def get_response_stream(self, user_input):
+        try:
+            yield from self.deltas
+        finally:
+            self.closed = True
+    
+    def close(self):
+        pass
+
+
+@unittest.skipUnless(speech_processor is not None, "needs pygame")
+class TestSpeakStreamedResponse(unittest.TestCase):
+    """Test cases for speak_streamed_response"""
+    
+    def setUp(self):
+        """Point temp and saved audio at a scratch directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.saved_dir = os.path.join(self.temp_dir, "saved")
+        for name, value in (("TEMP_AUDIO_DIR", self.temp_dir), ("AI_AUDIO_DIR", self.saved_dir),
+                            ("SAVE_AI_AUDIO", True), ("VERBOSE_MODE", False)):
+            patcher = patch.object(speech_processor, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.played = []
+        self.processor = speech_processor.SpeechProcessor.__new__(speech_processor.SpeechProcessor)
+        self.processor.pygame_initialized = False
+        self.processor.play_audio = lambda audio_file: self.played.append(audio_file) or True
+    
+    def tearDown(self):
+        """Clean up the scratch directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def saved_files(self):
+        """Reply audio files saved to permanent storage"""
+        return os.listdir(self.saved_dir) if os.path.isdir(self.saved_dir) else []
+    
+    def test_reply_spoken_and_saved_once(self):
+        """Every sentence is played in order and the reply is saved as one file"""
+        self.processor.tts_model = _FakeTTS()
+        self.processor.ai_chat = _FakeChat(["Hello Dr. Who. ", "How are", " you? Fine."])
+        
+        reply = self.processor.speak_streamed_response("hi")
+        
+        self.assertEqual(reply, "Hello Dr. Who. How are you? Fine.")
+        self.assertEqual(len(self.played), 3)
+        self.assertTrue(self.processor.ai_chat.closed)
+        saved = self.saved_files()
+        self.assertEqual(len(saved), 1)
+        with wave.open(os.path.join(self.saved_dir, saved[0]), 'rb') as wf:
+            self.assertEqual(wf.getnframes(), 300)
+    
+    def test_synthesis_error_closes_stream(self):
+        """A failed sentence ends the reply and still closes the stream"""
+        self.processor.tts_model = _FakeTTS(fail_on="Two.")
+        self.processor.ai_chat = _FakeChat(["One. ", "Two. ", "Three. ", "Four."])
+        
+        reply = self.processor.speak_streamed_response("hi")
+        
+        self.assertEqual(reply, "One. Two.")
+        self.assertEqual(len(self.played), 1)
+        self.assertTrue(self.processor.ai_chat.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()